@@ -9,7 +9,6 @@
 """
 from __future__ import annotations
 
-import hashlib
 import json
 import queue
 import shutil
@@ -21,6 +20,7 @@ from typing import Optional
 
 from app.api.persistence import get_store
 from app.cache.bundle import ArtifactInfo, BundleManager, BundleManifest
+from app.cache.cache_key import compute_file_hash
 from app.cache.cache_service import get_cache_service
 from app.core.profile import get_processing_profile
 from app.core.utils.logger import setup_logger
@@ -138,15 +138,8 @@ class JobQueue:
         return True
 
     def _compute_file_hash(self, file_path: Path, chunk_size: int = 8 * 1024 * 1024) -> str:
-        """分块计算文件 SHA256 哈希，避免大文件一次性读入内存。"""
-        hasher = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                hasher.update(chunk)
-        return hasher.hexdigest()
+        """流式计算文件 SHA256 哈希，避免大文件一次性读入内存。"""
+        return compute_file_hash(str(file_path), chunk_size)
 
     def _write_asr_json(self, ctx: PipelineContext, target_dir: Path) -> None:
         """将语音识别（ASR）结果序列化为 JSON 写入产物目录。"""
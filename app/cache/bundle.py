@@ -8,7 +8,6 @@ Bundle 是缓存产物的存储单元，包含:
 
 from __future__ import annotations
 
-import hashlib
 import json
 import shutil
 import time
@@ -16,6 +15,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from app.cache.cache_key import compute_file_hash
 from app.config import BUNDLE_PATH, PROFILE_VERSION, TMP_PATH
 from app.core.utils.logger import setup_logger
 
@@ -383,11 +383,4 @@ class BundleManager:
 
     def _compute_file_hash(self, file_path: Path, chunk_size: int = 8 * 1024 * 1024) -> str:
         """计算文件 SHA256"""
-        hasher = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                hasher.update(chunk)
-        return hasher.hexdigest()
+        return compute_file_hash(str(file_path), chunk_size)
@@ -114,9 +114,12 @@ def compute_url_cache_key(url: str) -> str:
 def compute_file_hash(file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
     """流式计算文件 SHA256
 
+    Python 3.11+ 使用 hashlib.file_digest，在 C 层复用缓冲区读取并释放 GIL；
+    旧版本回退为按块读取。
+
     Args:
         file_path: 文件路径
-        chunk_size: 读取块大小
+        chunk_size: 读取块大小（仅回退路径使用）
 
     Returns:
         文件内容的 SHA256 十六进制字符串
@@ -125,15 +128,17 @@ def compute_file_hash(file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
     if not path.exists():
         raise FileNotFoundError(f"文件不存在: {file_path}")
 
-    hasher = hashlib.sha256()
     with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        hasher = hashlib.sha256()
         while True:
             chunk = f.read(chunk_size)
             if not chunk:
                 break
             hasher.update(chunk)
-
-    return hasher.hexdigest()
+        return hasher.hexdigest()
 
 
 def compute_local_cache_key(file_hash: str) -> str:
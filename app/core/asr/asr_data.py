@@ -3,6 +3,7 @@ import math
 import os
 import platform
 import re
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -11,6 +12,8 @@ from langdetect import LangDetectException, detect
 from ..entities import SubtitleLayoutEnum
 from ..utils.text_utils import is_mainly_cjk
 
+_start_time_key = attrgetter("start_time")
+
 # 多语言分词模式(支持词级和字符级语言)
 _WORD_SPLIT_PATTERN = (
     r"[a-zA-Z\u00c0-\u00ff\u0100-\u017f']+"  # 拉丁字符(含扩展)
@@ -50,6 +53,9 @@ def handle_long_path(path: str) -> str:
 
 
 class ASRDataSeg:
+    # 长字幕会创建成千上万个片段，使用 __slots__ 省去每个实例的 __dict__
+    __slots__ = ("text", "translated_text", "start_time", "end_time")
+
     def __init__(
         self, text: str, start_time: int, end_time: int, translated_text: str = ""
     ):
@@ -105,9 +111,11 @@ class ASRDataSeg:
 
 class ASRData:
     def __init__(self, segments: List[ASRDataSeg]):
-        filtered_segments = [seg for seg in segments if seg.text and seg.text.strip()]
-        filtered_segments.sort(key=lambda x: x.start_time)
-        self.segments = filtered_segments
+        # 过滤与排序合并为一次 sorted 调用，attrgetter 取键不经过 Python 帧
+        self.segments = sorted(
+            (seg for seg in segments if seg.text and seg.text.strip()),
+            key=_start_time_key,
+        )
 
     def __iter__(self):
         return iter(self.segments)
@@ -96,10 +96,13 @@ class BaseASR:
         Returns:
             ASRData: Recognition results with segments
         """
-        cache_key = f"{self.__class__.__name__}:{self._get_key()}"
+        # 仅在启用缓存时才计算 key（部分子类的 _get_key 需要构建命令并做哈希）
+        cache_key: Optional[str] = None
+        if self.use_cache and is_cache_enabled():
+            cache_key = f"{self.__class__.__name__}:{self._get_key()}"
 
         # Try cache first
-        if self.use_cache and is_cache_enabled():
+        if cache_key is not None:
             cached_result = cast(
                 Optional[dict], self._cache.get(cache_key, default=None)
             )
@@ -112,7 +115,8 @@ class BaseASR:
         resp_data = self._run(callback, **kwargs)
 
         # Cache result
-        self._cache.set(cache_key, resp_data, expire=86400 * 2)
+        if cache_key is not None:
+            self._cache.set(cache_key, resp_data, expire=86400 * 2)
 
         segments = self._make_segments(resp_data)
         return ASRData(segments)
@@ -263,44 +263,30 @@ class FasterWhisperASR(BaseASR):
             error_msg = ""
             last_progress = 0
 
-            # 实时处理输出
-            while True:
-                # 检查进程状态
-                if self.process.poll() is not None:
-                    # 进程已结束，读取剩余输出
-                    for stream_name, line in reader.get_remaining_output():
-                        line = line.strip()
-                        if line:
-                            if "error" in line:
-                                error_msg += line
-                            else:
-                                logger.info(line)
-                    break
-
-                # 读取输出
-                output = reader.get_output(timeout=0.1)
-                if output:
-                    stream_name, line = output
-                    line = line.strip()
-                    if line:
-                        # 解析进度百分比
-                        if match := re.search(r"(\d+)%", line):
-                            progress = int(match.group(1))
-                            if progress == 100:
-                                is_finish = True
-                            mapped_progress = int(5 + (progress * 0.9))
-                            # 只允许进度单调递增
-                            if mapped_progress > last_progress:
-                                last_progress = mapped_progress
-                                callback(mapped_progress, f"{mapped_progress}%")
-                        if "Subtitles are written to" in line:
-                            is_finish = True
-                            callback(*ASRStatus.COMPLETED.callback_tuple())
-                        if "error" in line or "Error" in line:
-                            error_msg += line
-                            logger.error(line)
-                        else:
-                            logger.info(line)
+            # 实时处理输出：阻塞等待，直到 stdout 读到结束标记
+            for _, line in reader.iter_output():
+                line = line.strip()
+                if not line:
+                    continue
+                # 解析进度百分比
+                if match := re.search(r"(\d+)%", line):
+                    progress = int(match.group(1))
+                    if progress == 100:
+                        is_finish = True
+                    mapped_progress = int(5 + (progress * 0.9))
+                    # 只允许进度单调递增
+                    if mapped_progress > last_progress:
+                        last_progress = mapped_progress
+                        callback(mapped_progress, f"{mapped_progress}%")
+                if "Subtitles are written to" in line:
+                    is_finish = True
+                    callback(*ASRStatus.COMPLETED.callback_tuple())
+                if "error" in line or "Error" in line:
+                    error_msg += line
+                    logger.error(line)
+                else:
+                    logger.info(line)
+            self.process.wait()
 
             if not is_finish:
                 logger.error("Faster Whisper 错误: %s", error_msg)
@@ -34,15 +34,21 @@ class ASRStatus(Enum):
     FINALIZING = ("finalizing", 95)
     COMPLETED = ("completed", 100)
 
+    def __init__(self, message: str, progress: int):
+        # Enum.value goes through a descriptor; store the fields once per member
+        self._message = message
+        self._progress = progress
+        self._callback_tuple = (progress, message)
+
     @property
     def message(self) -> str:
         """Get the status message."""
-        return self.value[0]
+        return self._message
 
     @property
     def progress(self) -> int:
         """Get the progress percentage (0-100)."""
-        return self.value[1]
+        return self._progress
 
     def with_progress(self, progress: int) -> Tuple[int, str]:
         """Create a callback tuple with custom progress.
@@ -53,8 +59,8 @@ class ASRStatus(Enum):
         Returns:
             Tuple of (progress, message) suitable for callback functions
         """
-        return (progress, self.message)
+        return (progress, self._message)
 
     def callback_tuple(self) -> Tuple[int, str]:
         """Get the callback tuple (progress, message)."""
-        return (self.progress, self.message)
+        return self._callback_tuple
@@ -154,7 +154,6 @@ class WhisperCppASR(BaseASR):
                     stderr=subprocess.PIPE,
                     text=True,
                     encoding="utf-8",
-                    bufsize=1,
                 )
 
                 logger.info(f"Whisper.cpp process started, PID: {self.process.pid}")
@@ -165,45 +164,31 @@ class WhisperCppASR(BaseASR):
 
                 last_progress = 0
 
-                while True:
-                    # Check process status
-                    if self.process.poll() is not None:
-                        time.sleep(0.2)
-                        for stream_name, line in reader.get_remaining_output():
-                            if stream_name == "stderr":
-                                logger.debug(f"[stderr] {line.strip()}")
-                        break
-
-                    # Non-blocking output reading
-                    output = reader.get_output(timeout=0.1)
-                    if output:
-                        stream_name, line = output
-
-                        if stream_name == "stdout":
-                            logger.debug(f"[stdout] {line.strip()}")
-
-                            # Parse progress
-                            if " --> " in line and "[" in line:
-                                try:
-                                    time_str = (
-                                        line.split("[")[1].split(" -->")[0].strip()
-                                    )
-                                    parts = time_str.split(":")
-                                    current_time = sum(
-                                        float(x) * y
-                                        for x, y in zip(reversed(parts), [1, 60, 3600])
-                                    )
-                                    progress = int(
-                                        min(current_time / total_duration * 100, 98)
-                                    )
-
-                                    if progress > last_progress:
-                                        last_progress = progress
-                                        callback(progress, f"{progress}%")
-                                except (ValueError, IndexError) as e:
-                                    logger.debug(f"Progress parse failed: {e}")
-                        else:
-                            logger.debug(f"[stderr] {line.strip()}")
+                # Block until both streams have been drained
+                for stream_name, line in reader.iter_output():
+                    if stream_name != "stdout":
+                        logger.debug(f"[stderr] {line.strip()}")
+                        continue
+
+                    logger.debug(f"[stdout] {line.strip()}")
+
+                    # Parse progress
+                    if " --> " in line and "[" in line:
+                        try:
+                            time_str = line.split("[")[1].split(" -->")[0].strip()
+                            parts = time_str.split(":")
+                            current_time = sum(
+                                float(x) * y
+                                for x, y in zip(reversed(parts), [1, 60, 3600])
+                            )
+                            progress = int(min(current_time / total_duration * 100, 98))
+
+                            if progress > last_progress:
+                                last_progress = progress
+                                callback(progress, f"{progress}%")
+                        except (ValueError, IndexError) as e:
+                            logger.debug(f"Progress parse failed: {e}")
+                self.process.wait()
 
                 # Check return code
                 if self.process.returncode != 0:
@@ -121,7 +121,7 @@ def _call_llm_api(
     """实际调用 LLM API（带重试）"""
     client = get_llm_client()
     prompt_chars = _estimate_prompt_chars(messages)
-    start = time.time()
+    start = time.perf_counter()
     logger.info(
         "LLM request start: model=%s, messages=%d, prompt_chars=%d, temperature=%s",
         model,
@@ -138,18 +138,22 @@ def _call_llm_api(
             **kwargs,
         )
     except Exception:
-        elapsed_ms = int((time.time() - start) * 1000)
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
         logger.exception("LLM request failed after %d ms", elapsed_ms)
         raise
 
     # 记录响应内容
     log_llm_response(response)
-    elapsed_ms = int((time.time() - start) * 1000)
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
     response_id = getattr(response, "id", "")
+    usage = getattr(response, "usage", None)
     logger.info(
-        "LLM request done: model=%s, duration_ms=%d, response_id=%s",
+        "LLM request done: model=%s, duration_ms=%d, prompt_tokens=%s, "
+        "completion_tokens=%s, response_id=%s",
         model,
         elapsed_ms,
+        getattr(usage, "prompt_tokens", None),
+        getattr(usage, "completion_tokens", None),
         response_id,
     )
 
@@ -35,37 +35,36 @@ def is_cache_enabled() -> bool:
     return _cache_enabled
 
 
-# Predefined cache instances for common use cases
-_llm_cache = Cache(str(CACHE_PATH / "llm_translation"))
-_asr_cache = Cache(str(CACHE_PATH / "asr_results"), tag_index=True)
-_tts_cache = Cache(str(CACHE_PATH / "tts_audio"))
-_translate_cache = Cache(str(CACHE_PATH / "translate_results"))
-_version_state_cache = Cache(str(CACHE_PATH / "version_state"))
-
-
+# Predefined cache instances for common use cases, opened lazily on first
+# use so that importing this module does not open every SQLite database.
+@functools.lru_cache(maxsize=1)
 def get_llm_cache() -> Cache:
     """Get LLM translation cache instance."""
-    return _llm_cache
+    return Cache(str(CACHE_PATH / "llm_translation"))
 
 
+@functools.lru_cache(maxsize=1)
 def get_asr_cache() -> Cache:
     """Get ASR results cache instance."""
-    return _asr_cache
+    return Cache(str(CACHE_PATH / "asr_results"), tag_index=True)
 
 
+@functools.lru_cache(maxsize=1)
 def get_translate_cache() -> Cache:
     """Get translate cache instance."""
-    return _translate_cache
+    return Cache(str(CACHE_PATH / "translate_results"))
 
 
+@functools.lru_cache(maxsize=1)
 def get_tts_cache() -> Cache:
     """Get TTS audio cache instance."""
-    return _tts_cache
+    return Cache(str(CACHE_PATH / "tts_audio"))
 
 
+@functools.lru_cache(maxsize=1)
 def get_version_state_cache() -> Cache:
     """Get version check state cache instance."""
-    return _version_state_cache
+    return Cache(str(CACHE_PATH / "version_state"))
 
 
 def memoize(cache_instance: Cache, **kwargs):
@@ -111,7 +110,7 @@ def generate_cache_key(data: Any) -> str:
         data: Data to generate key from
 
     Returns:
-        SHA256 hash of the data
+        BLAKE2b-128 hex digest of the data
     """
 
     def _serialize(obj: Any) -> Any:
@@ -127,4 +126,4 @@ def generate_cache_key(data: Any) -> str:
 
     serialized_data = _serialize(data)
     data_str = json.dumps(serialized_data, ensure_ascii=False, sort_keys=True)
-    return hashlib.sha256(data_str.encode()).hexdigest()
+    return hashlib.blake2b(data_str.encode(), digest_size=16).hexdigest()
@@ -3,7 +3,7 @@
 import queue
 import subprocess
 import threading
-from typing import Callable, Optional, Tuple
+from typing import Callable, Iterator, Optional, Tuple
 
 from ..utils.logger import setup_logger
 
@@ -47,7 +47,7 @@ class StreamReader:
             self.threads.append(stderr_thread)
 
     def _read_stream(self, stream, stream_name: str) -> None:
-        """读取流并放入队列"""
+        """读取流并放入队列，结束时放入 (stream_name, None) 作为结束标记"""
         try:
             for line in iter(stream.readline, ""):
                 if line:
@@ -55,7 +55,10 @@ class StreamReader:
         except Exception as e:
             logger.debug(f"读取 {stream_name} 结束: {e}")
         finally:
-            stream.close()
+            try:
+                stream.close()
+            finally:
+                self.output_queue.put((stream_name, None))
 
     def get_output(self, timeout: float = 0.1) -> Optional[Tuple[str, str]]:
         """
@@ -65,21 +68,34 @@ class StreamReader:
             timeout: 等待超时时间
 
         Returns:
-            (stream_name, line) 或 None
+            (stream_name, line) 或 None（超时或读到结束标记）
         """
         try:
-            return self.output_queue.get(timeout=timeout)
+            output = self.output_queue.get(timeout=timeout)
         except queue.Empty:
             return None
+        return output if output[1] is not None else None
+
+    def iter_output(self) -> Iterator[Tuple[str, str]]:
+        """阻塞迭代所有输出，直到每个读取线程都发出结束标记"""
+        remaining = len(self.threads)
+        while remaining:
+            stream_name, line = self.output_queue.get()
+            if line is None:
+                remaining -= 1
+                continue
+            yield stream_name, line
 
     def get_remaining_output(self) -> list:
         """获取队列中剩余的所有输出"""
         output = []
         while not self.output_queue.empty():
             try:
-                output.append(self.output_queue.get_nowait())
+                item = self.output_queue.get_nowait()
             except queue.Empty:
                 break
+            if item[1] is not None:
+                output.append(item)
         return output
 
     def is_empty(self) -> bool:
@@ -127,38 +143,29 @@ def run_process_with_stream_reader(
         "stderr": subprocess.PIPE,
         "text": True,
         "encoding": "utf-8",
-        "bufsize": 1,  # 行缓冲
+        # 块缓冲：行缓冲只作用于写入，对读取管道没有意义
+        "bufsize": -1,
     }
     default_kwargs.update(popen_kwargs)
 
     # 启动进程
     process = subprocess.Popen(cmd, **default_kwargs)
 
+    def dispatch(stream_name: str, line: str) -> None:
+        if stream_name == "stdout" and stdout_handler:
+            stdout_handler(line)
+        elif stream_name == "stderr" and stderr_handler:
+            stderr_handler(line)
+
     # 创建流读取器
     reader = StreamReader(process)
     reader.start_reading()
 
-    # 处理输出的线程
+    # 处理输出的线程：阻塞等待输出，两个流都结束后再回收进程
     def process_output():
-        while True:
-            # 检查进程状态
-            if process.poll() is not None:
-                # 进程已结束，读取剩余输出
-                for stream_name, line in reader.get_remaining_output():
-                    if stream_name == "stdout" and stdout_handler:
-                        stdout_handler(line)
-                    elif stream_name == "stderr" and stderr_handler:
-                        stderr_handler(line)
-                break
-
-            # 读取输出
-            output = reader.get_output()
-            if output:
-                stream_name, line = output
-                if stream_name == "stdout" and stdout_handler:
-                    stdout_handler(line)
-                elif stream_name == "stderr" and stderr_handler:
-                    stderr_handler(line)
+        for stream_name, line in reader.iter_output():
+            dispatch(stream_name, line)
+        process.wait()
 
     # 如果提供了处理函数，启动处理线程
     if stdout_handler or stderr_handler:
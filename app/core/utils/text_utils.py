@@ -9,7 +9,8 @@ import re
 
 # 按字符计数的语言（不使用空格分词）
 # 包括：CJK（中日韩）+ 东南亚/南亚语言（泰文/缅甸文/高棉文/印地语等）
-_NO_SPACE_LANGUAGES = r"[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u0900-\u0dff]"
+_NO_SPACE_RANGES = r"\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u0900-\u0dff"
+_NO_SPACE_LANGUAGES = rf"[{_NO_SPACE_RANGES}]"
 
 # 需要空格分隔的语言（按单词计数）
 # 包括：拉丁字母、西里尔字母、希腊字母、阿拉伯字母、希伯来字母、泰文
@@ -17,10 +18,17 @@ _SPACE_SEPARATED_LANGUAGES = (
     r"^[a-zA-Z0-9\'\u0400-\u04ff\u0370-\u03ff\u0600-\u06ff\u0590-\u05ff\u0e00-\u0e7f]+$"
 )
 
+# 预编译正则，避免每次调用都经过 re 模块的模式缓存查找
+_NO_SPACE_RE = re.compile(_NO_SPACE_LANGUAGES)
+_SPACE_SEPARATED_RE = re.compile(_SPACE_SEPARATED_LANGUAGES)
+_WORD_CHAR_RE = re.compile(r"\w", re.UNICODE)
+# 计数单元：单个不使用空格的字符，或一段不含空白和此类字符的连续文本（一个单词）
+_COUNT_UNIT_RE = re.compile(rf"{_NO_SPACE_LANGUAGES}|[^\s{_NO_SPACE_RANGES}]+")
+
 
 def is_pure_punctuation(text: str) -> bool:
     """检查文本是否仅包含标点符号"""
-    return not re.search(r"\w", text, re.UNICODE)
+    return not _WORD_CHAR_RE.search(text)
 
 
 def is_mainly_cjk(text: str, threshold: float = 0.5) -> bool:
@@ -35,11 +43,13 @@ def is_mainly_cjk(text: str, threshold: float = 0.5) -> bool:
     Returns:
         True表示主要为不使用空格的亚洲语言，False表示其他
     """
-    if not text:
+    if not text or text.isascii():
+        # 纯 ASCII 文本不可能包含不使用空格的亚洲语言字符
         return False
 
-    no_space_count = len(re.findall(_NO_SPACE_LANGUAGES, text))
-    total_chars = len("".join(text.split()))
+    no_space_count = len(_NO_SPACE_RE.findall(text))
+    # 直接累加各片段长度，省去 join 生成的整段副本
+    total_chars = sum(map(len, text.split()))
 
     return no_space_count / total_chars > threshold if total_chars > 0 else False
 
@@ -66,7 +76,7 @@ def is_space_separated_language(text: str) -> bool:
     """
     if not text:
         return False
-    return bool(re.match(_SPACE_SEPARATED_LANGUAGES, text.strip()))
+    return bool(_SPACE_SEPARATED_RE.match(text.strip()))
 
 
 def count_words(text: str) -> int:
@@ -95,11 +105,10 @@ def count_words(text: str) -> int:
     if not text:
         return 0
 
-    # 统计不使用空格的语言的字符数（CJK + 泰文/缅甸文等）
-    char_count = len(re.findall(_NO_SPACE_LANGUAGES, text))
-
-    # 移除不使用空格的字符后，统计使用空格的语言的单词数
-    word_text = re.sub(_NO_SPACE_LANGUAGES, " ", text)
-    word_count = len(word_text.strip().split())
+    # 纯 ASCII 文本只有按空格分词的单词，str.split 比正则扫描更快
+    if text.isascii():
+        return len(text.split())
 
-    return char_count + word_count
+    # 单次扫描：每个不使用空格的字符（CJK + 泰文/缅甸文等）计 1，
+    # 被空白或此类字符分隔开的每段其余文本计 1 个单词
+    return len(_COUNT_UNIT_RE.findall(text))
@@ -1,6 +1,9 @@
+import json
 import os
 import re
 import subprocess
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -9,6 +12,24 @@ from ..utils.logger import setup_logger
 
 logger = setup_logger("video_utils")
 
+# Windows 下隐藏 ffmpeg 控制台窗口
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+
+# 失败时记录的 ffmpeg stderr 末尾行数
+_STDERR_TAIL_LINES = 200
+
+# ffmpeg -i 输出解析（ffprobe 不可用时的回退路径）
+_FFMPEG_INFO_MAX_BYTES = 65536
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+\.\d+)")
+_BITRATE_RE = re.compile(r"bitrate: (\d+) kb/s")
+_VIDEO_STREAM_RE = re.compile(
+    r"Video: (\w+)(?:\s*\([^)]*\))?.* (\d+)x(\d+).*?(?:(\d+(?:\.\d+)?)\s*(?:fps|tb[rn]))"
+)
+_AUDIO_CODEC_RE = re.compile(r"Audio: (\w+).* (\d+) Hz")
+_AUDIO_STREAM_RE = re.compile(
+    r"Stream #\d+:(\d+)(?:\[0x[0-9a-fA-F]+\])?(?:\(([a-z]{3})\))?: Audio: (\w+)"
+)
+
 
 def video2audio(input_file: str, output: str = "", audio_track_index: int = 0) -> bool:
     """使用 ffmpeg 将视频转换为音频
@@ -44,41 +65,59 @@ def video2audio(input_file: str, output: str = "", audio_track_index: int = 0) -
     logger.info(f"转换为音频执行命令: {' '.join(cmd)}")
 
     try:
-        result = subprocess.run(
+        # ffmpeg 不写 stdout；stderr 只保留末尾若干行，避免长时间转码的日志占满内存
+        with subprocess.Popen(
             cmd,
-            capture_output=True,
-            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             encoding="utf-8",
             errors="replace",
-            creationflags=(
-                getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
-            ),
-        )
-        if result.returncode == 0 and Path(output).is_file():
+            creationflags=_CREATION_FLAGS,
+        ) as process:
+            assert process.stderr is not None
+            stderr_tail = deque(process.stderr, maxlen=_STDERR_TAIL_LINES)
+
+        if process.returncode == 0 and output_path.is_file():
             logger.info("音频转换成功")
             return True
+
+        if process.returncode != 0:
+            logger.error("== ffmpeg 执行失败 ==")
+            logger.error(f"返回码: {process.returncode}")
+            logger.error(f"命令: {' '.join(cmd)}")
+            if stderr_tail:
+                logger.error(f"标准错误: {''.join(stderr_tail)}")
         else:
             logger.error("音频转换失败")
-            return False
-    except subprocess.CalledProcessError as e:
-        logger.error("== ffmpeg 执行失败 ==")
-        logger.error(f"返回码: {e.returncode}")
-        logger.error(f"命令: {' '.join(e.cmd)}")
-        if e.stdout:
-            logger.error(f"标准输出: {e.stdout}")
-        if e.stderr:
-            logger.error(f"标准错误: {e.stderr}")
         return False
     except Exception as e:
         logger.exception(f"音频转换出错: {str(e)}")
         return False
 
 
+@dataclass
+class _MediaProbe:
+    """媒体探测结果（get_video_info 内部使用）"""
+
+    duration_seconds: float = 0.0
+    bitrate_kbps: int = 0
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    video_codec: str = ""
+    has_video_stream: bool = False
+    audio_codec: str = ""
+    audio_sampling_rate: int = 0
+    audio_streams: list[AudioStreamInfo] = field(default_factory=list)
+
+
 def get_video_info(
     file_path: str, thumbnail_path: Optional[str] = None
 ) -> Optional["VideoInfo"]:
     """获取媒体文件信息（支持视频和音频文件）
 
+    优先使用 ffprobe 的 JSON 输出，ffprobe 不可用时回退到解析 ffmpeg -i 的输出。
+
     Args:
         file_path: 媒体文件路径（视频或音频）
         thumbnail_path: 缩略图保存路径（可选，仅对视频文件有效）
@@ -88,59 +127,188 @@ def get_video_info(
         对于纯音频文件，视频相关字段（width/height/fps）将为 0
     """
     try:
-        # 执行 ffmpeg 获取视频信息
+        probe = _probe_with_ffprobe(file_path)
+        if probe is None:
+            probe = _probe_with_ffmpeg(file_path)
+
+        if probe.audio_streams:
+            logger.info(f"检测到 {len(probe.audio_streams)} 条音轨")
+
+        # 验证文件是否包含有效的媒体流
+        if not probe.has_video_stream and not probe.audio_streams:
+            logger.error("文件既没有视频流也没有音频流，可能不是有效的媒体文件")
+            return None
+
+        # 提取缩略图（如果指定了路径且有视频流）
+        final_thumbnail_path = ""
+        if thumbnail_path and probe.duration_seconds > 0 and probe.has_video_stream:
+            if _extract_thumbnail(
+                file_path, probe.duration_seconds * 0.3, thumbnail_path
+            ):
+                final_thumbnail_path = thumbnail_path
+
+        # 构造并返回 VideoInfo 对象
+        return VideoInfo(
+            file_name=Path(file_path).stem,
+            file_path=file_path,
+            width=probe.width,
+            height=probe.height,
+            fps=probe.fps,
+            duration_seconds=probe.duration_seconds,
+            bitrate_kbps=probe.bitrate_kbps,
+            video_codec=probe.video_codec,
+            audio_codec=probe.audio_codec,
+            audio_sampling_rate=probe.audio_sampling_rate,
+            thumbnail_path=final_thumbnail_path,
+            audio_streams=probe.audio_streams,
+        )
+    except Exception as e:
+        logger.exception(f"获取视频信息时出错: {str(e)}")
+        return None
+
+
+def _probe_with_ffprobe(file_path: str) -> Optional[_MediaProbe]:
+    """使用 ffprobe 获取媒体信息，ffprobe 不可用或执行失败时返回 None"""
+    try:
         result = subprocess.run(
-            ["ffmpeg", "-i", file_path],
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-print_format",
+                "json",
+                "-show_streams",
+                "-show_format",
+                file_path,
+            ],
             capture_output=True,
             text=True,
             encoding="utf-8",
             errors="replace",
-            creationflags=(
-                getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
-            ),
+            creationflags=_CREATION_FLAGS,
         )
-        info = result.stderr
+    except FileNotFoundError:
+        logger.debug("未找到 ffprobe，回退到 ffmpeg 解析媒体信息")
+        return None
+
+    if result.returncode != 0:
+        logger.debug(f"ffprobe 执行失败，回退到 ffmpeg: {result.stderr.strip()}")
+        return None
 
-        # 提取时长
-        duration_seconds = 0.0
-        if duration_match := re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", info):
-            hours, minutes, seconds = map(float, duration_match.groups())
-            duration_seconds = hours * 3600 + minutes * 60 + seconds
+    try:
+        return _parse_ffprobe_output(json.loads(result.stdout))
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.debug(f"ffprobe 输出解析失败，回退到 ffmpeg: {e}")
+        return None
+
+
+def _parse_frame_rate(rate: str) -> float:
+    """解析 ffprobe 的帧率字符串（如 "30000/1001"）"""
+    num, _, den = rate.partition("/")
+    try:
+        num_f = float(num)
+        den_f = float(den) if den else 1.0
+    except ValueError:
+        return 0.0
+    return num_f / den_f if den_f else 0.0
+
+
+def _parse_ffprobe_output(data: dict) -> _MediaProbe:
+    """将 ffprobe JSON 输出转换为探测结果"""
+    probe = _MediaProbe()
+    fmt = data.get("format") or {}
+
+    if duration := fmt.get("duration"):
+        probe.duration_seconds = float(duration)
+    if bit_rate := fmt.get("bit_rate"):
+        probe.bitrate_kbps = int(bit_rate) // 1000
+
+    for stream in data.get("streams") or []:
+        codec_type = stream.get("codec_type")
+        if codec_type == "video" and not probe.has_video_stream:
+            probe.video_codec = stream.get("codec_name", "")
+            probe.width = int(stream.get("width") or 0)
+            probe.height = int(stream.get("height") or 0)
+            probe.fps = _parse_frame_rate(
+                stream.get("avg_frame_rate") or ""
+            ) or _parse_frame_rate(stream.get("r_frame_rate") or "")
+            probe.has_video_stream = True
+        elif codec_type == "audio":
+            codec = stream.get("codec_name", "")
+            tags = stream.get("tags") or {}
+            if not probe.audio_streams:
+                # 第一条音频流信息（用于兼容性）
+                probe.audio_codec = codec
+                probe.audio_sampling_rate = int(stream.get("sample_rate") or 0)
+            probe.audio_streams.append(
+                AudioStreamInfo(
+                    index=int(stream.get("index", len(probe.audio_streams))),
+                    codec=codec,
+                    language=tags.get("language", ""),
+                    title=tags.get("title", ""),
+                )
+            )
+
+    return probe
+
+
+def _probe_with_ffmpeg(file_path: str) -> _MediaProbe:
+    """解析 ffmpeg -i 的输出获取媒体信息（ffprobe 不可用时的回退方案）"""
+    # 执行 ffmpeg 获取视频信息；所需信息都在输出开头的流头部，
+    # 只读取前 64KB，避免损坏文件输出大量警告时整段读入内存
+    with subprocess.Popen(
+        ["ffmpeg", "-i", file_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        creationflags=_CREATION_FLAGS,
+    ) as process:
+        head = process.stderr.read(_FFMPEG_INFO_MAX_BYTES)
+        if process.poll() is None:
+            process.kill()
+
+    return _parse_ffmpeg_info(head.decode("utf-8", errors="replace"))
+
+
+def _parse_ffmpeg_info(info: str) -> _MediaProbe:
+    """解析 ffmpeg -i 输出的媒体信息"""
+    probe = _MediaProbe()
+
+    # 提取时长
+    if duration_match := _DURATION_RE.search(info):
+        hours, minutes, seconds = map(float, duration_match.groups())
+        probe.duration_seconds = hours * 3600 + minutes * 60 + seconds
+
+    # 提取比特率
+    if bitrate_match := _BITRATE_RE.search(info):
+        probe.bitrate_kbps = int(bitrate_match.group(1))
 
-        # 提取比特率
-        bitrate_kbps = 0
-        if bitrate_match := re.search(r"bitrate: (\d+) kb/s", info):
-            bitrate_kbps = int(bitrate_match.group(1))
+    # 流信息每条占一行，逐行匹配，避免跨行回溯
+    for line in info.splitlines():
+        line = line.strip()
+        if not line.startswith("Stream #"):
+            continue
 
         # 提取视频流信息
-        width, height, fps, video_codec = 0, 0, 0.0, ""
-        has_video_stream = False
-        if video_stream_match := re.search(
-            r"Stream #.*?Video: (\w+)(?:\s*\([^)]*\))?.* (\d+)x(\d+).*?(?:(\d+(?:\.\d+)?)\s*(?:fps|tb[rn]))",
-            info,
-            re.DOTALL,
+        if not probe.has_video_stream and (
+            video_stream_match := _VIDEO_STREAM_RE.search(line)
         ):
-            video_codec = video_stream_match.group(1)
-            width = int(video_stream_match.group(2))
-            height = int(video_stream_match.group(3))
-            fps = float(video_stream_match.group(4))
-            has_video_stream = True
+            probe.video_codec = video_stream_match.group(1)
+            probe.width = int(video_stream_match.group(2))
+            probe.height = int(video_stream_match.group(3))
+            probe.fps = float(video_stream_match.group(4))
+            probe.has_video_stream = True
+            continue
 
         # 提取第一条音频流信息（用于兼容性）
-        audio_codec, audio_sampling_rate = "", 0
-        if audio_stream_match := re.search(
-            r"Stream #\d+:\d+.*Audio: (\w+).* (\d+) Hz", info
+        if not probe.audio_codec and (
+            audio_stream_match := _AUDIO_CODEC_RE.search(line)
         ):
-            audio_codec = audio_stream_match.group(1)
-            audio_sampling_rate = int(audio_stream_match.group(2))
+            probe.audio_codec = audio_stream_match.group(1)
+            probe.audio_sampling_rate = int(audio_stream_match.group(2))
 
         # 提取所有音频流信息（用于多音轨选择）
-        audio_streams: list[AudioStreamInfo] = []
-        for match in re.finditer(
-            r"Stream #\d+:(\d+)(?:\[0x[0-9a-fA-F]+\])?(?:\(([a-z]{3})\))?: Audio: (\w+)",
-            info,
-        ):
-            audio_streams.append(
+        if match := _AUDIO_STREAM_RE.match(line):
+            probe.audio_streams.append(
                 AudioStreamInfo(
                     index=int(match.group(1)),
                     codec=match.group(3),
@@ -148,38 +316,7 @@ def get_video_info(
                 )
             )
 
-        if audio_streams:
-            logger.info(f"检测到 {len(audio_streams)} 条音轨")
-
-        # 验证文件是否包含有效的媒体流
-        if not has_video_stream and not audio_streams:
-            logger.error("文件既没有视频流也没有音频流，可能不是有效的媒体文件")
-            return None
-
-        # 提取缩略图（如果指定了路径且有视频流）
-        final_thumbnail_path = ""
-        if thumbnail_path and duration_seconds > 0 and has_video_stream:
-            if _extract_thumbnail(file_path, duration_seconds * 0.3, thumbnail_path):
-                final_thumbnail_path = thumbnail_path
-
-        # 构造并返回 VideoInfo 对象
-        return VideoInfo(
-            file_name=Path(file_path).stem,
-            file_path=file_path,
-            width=width,
-            height=height,
-            fps=fps,
-            duration_seconds=duration_seconds,
-            bitrate_kbps=bitrate_kbps,
-            video_codec=video_codec,
-            audio_codec=audio_codec,
-            audio_sampling_rate=audio_sampling_rate,
-            thumbnail_path=final_thumbnail_path,
-            audio_streams=audio_streams,
-        )
-    except Exception as e:
-        logger.exception(f"获取视频信息时出错: {str(e)}")
-        return None
+    return probe
 
 
 def _extract_thumbnail(video_path: str, seek_time: float, thumbnail_path: str) -> bool:
@@ -193,13 +330,15 @@ def _extract_thumbnail(video_path: str, seek_time: float, thumbnail_path: str) -
     Returns:
         是否成功
     """
-    if not Path(video_path).is_file():
+    video_file = Path(video_path)
+    thumbnail_file = Path(thumbnail_path)
+    if not video_file.is_file():
         logger.error(f"视频文件不存在: {video_path}")
         return False
 
     try:
         timestamp = f"{int(seek_time // 3600):02}:{int((seek_time % 3600) // 60):02}:{seek_time % 60:06.3f}"
-        Path(thumbnail_path).parent.mkdir(parents=True, exist_ok=True)
+        thumbnail_file.parent.mkdir(parents=True, exist_ok=True)
 
         result = subprocess.run(
             [
@@ -207,21 +346,19 @@ def _extract_thumbnail(video_path: str, seek_time: float, thumbnail_path: str) -
                 "-ss",
                 timestamp,
                 "-i",
-                Path(video_path).as_posix(),
+                video_file.as_posix(),
                 "-vframes",
                 "1",
                 "-q:v",
                 "2",
                 "-y",
-                Path(thumbnail_path).as_posix(),
+                thumbnail_file.as_posix(),
             ],
             capture_output=True,
             text=True,
             encoding="utf-8",
             errors="replace",
-            creationflags=(
-                getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
-            ),
+            creationflags=_CREATION_FLAGS,
         )
         return result.returncode == 0
 
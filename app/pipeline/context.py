@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import uuid
-from dataclasses import asdict, dataclass, field, is_dataclass
+from dataclasses import dataclass, field, fields, is_dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 from app.core.asr.asr_data import ASRData
 
+# 可直接输出的基础类型
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
 
 @dataclass
 class PipelineInputs:
@@ -39,7 +42,7 @@ class TraceEvent:
     retryable: Optional[bool] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineContext:
     """管线执行上下文，承载执行过程中的全局状态"""
 
@@ -78,6 +81,11 @@ class PipelineContext:
     # 扩展字段存储
     extra: Dict[str, Any] = field(default_factory=dict)
 
+    # 同一次运行内下载节点已提取的单视频 yt-dlp 元信息（URL -> info），仅供读取元数据
+    ydl_info: Dict[str, Mapping[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_inputs(
         cls,
@@ -122,13 +130,13 @@ class PipelineContext:
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取上下文中的值，优先从标准字段获取，否则从 extra 获取"""
-        if hasattr(self, key) and key != "extra":
+        if key in _READABLE_FIELDS:
             return getattr(self, key)
         return self.extra.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """设置上下文中的值，优先写入标准字段，否则写入 extra"""
-        if hasattr(self, key) and key not in ("extra", "trace", "thresholds", "run_id"):
+        if key in _WRITABLE_FIELDS:
             setattr(self, key, value)
         else:
             self.extra[key] = value
@@ -159,7 +167,16 @@ class PipelineContext:
 
     def _serialize_value(self, value: Any) -> Any:
         """将上下文值序列化为可 JSON 输出的结构"""
-        if value is None or isinstance(value, (str, int, float, bool)):
+        # 先按精确类型快速分派，子类再走下方的 isinstance 判断
+        value_type = type(value)
+        if value_type in _PRIMITIVE_TYPES:
+            return value
+        if value_type is dict:
+            return {k: self._serialize_value(v) for k, v in value.items()}
+        if value_type is list or value_type is tuple:
+            return [self._serialize_value(v) for v in value]
+
+        if isinstance(value, (str, int, float, bool)):
             return value
         if isinstance(value, ASRData):
             return value.to_json()
@@ -169,11 +186,16 @@ class PipelineContext:
             return {k: self._serialize_value(v) for k, v in value.items()}
         if isinstance(value, (list, tuple, set)):
             return [self._serialize_value(v) for v in value]
-        if is_dataclass(value):
-            return self._serialize_value(asdict(value))
-        if hasattr(value, "model_dump"):
+        if is_dataclass(value) and not isinstance(value, type):
+            # 逐字段递归，避免 asdict 先深拷贝整棵对象树再重复遍历
+            return {
+                f.name: self._serialize_value(getattr(value, f.name))
+                for f in fields(value)
+            }
+        model_dump = getattr(value, "model_dump", None)
+        if model_dump is not None:
             try:
-                return value.model_dump()
+                return model_dump()
             except Exception:
                 pass
         return str(value)
@@ -195,3 +217,10 @@ class PipelineContext:
             # extra 中的值也可用于条件
             **self.extra,
         }
+
+
+# get/set 可直接访问的标准字段（预先计算，避免每次调用 hasattr）
+_READABLE_FIELDS = frozenset(
+    f.name for f in fields(PipelineContext) if f.init and f.name != "extra"
+)
+_WRITABLE_FIELDS = _READABLE_FIELDS - {"trace", "thresholds", "run_id"}
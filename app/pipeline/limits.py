@@ -1,23 +1,39 @@
 """Concurrency limits for heavy pipeline stages."""
 from __future__ import annotations
 
+import functools
 import os
 import threading
 from contextlib import contextmanager
 from typing import Optional
 
+from app.core.utils.logger import setup_logger
 
+logger = setup_logger("pipeline_limits")
+
+
+# 环境变量在进程生命周期内视为不变，解析结果缓存
+@functools.lru_cache(maxsize=None)
 def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
     try:
-        return int(os.getenv(name, str(default)))
-    except Exception:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"环境变量 {name}={raw!r} 不是有效整数，使用默认值 {default}")
         return default
 
 
+@functools.lru_cache(maxsize=None)
 def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
     try:
-        return float(os.getenv(name, str(default)))
-    except Exception:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"环境变量 {name}={raw!r} 不是有效数字，使用默认值 {default}")
         return default
 
 
@@ -27,14 +43,20 @@ PIPELINE_STAGE_WAIT_SECONDS = _env_float("PIPELINE_STAGE_WAIT_SECONDS", 300.0)
 
 
 class ConcurrencyLimiter:
+    __slots__ = ("_sem", "name")
+
     def __init__(self, max_inflight: int, name: str) -> None:
-        self._sem = threading.Semaphore(max_inflight)
+        # BoundedSemaphore：多余的 release 会直接报错，而不是悄悄放大并发上限
+        self._sem = threading.BoundedSemaphore(max_inflight)
         self.name = name
 
     @contextmanager
     def acquire(self, timeout: Optional[float] = None):
         wait_seconds = timeout if timeout is not None else PIPELINE_STAGE_WAIT_SECONDS
-        acquired = self._sem.acquire(timeout=wait_seconds)
+        # 先尝试非阻塞获取，空闲时不进入带超时的等待路径
+        acquired = self._sem.acquire(blocking=False)
+        if not acquired:
+            acquired = self._sem.acquire(timeout=wait_seconds)
         if not acquired:
             raise RuntimeError(f"{self.name} 并发已达上限")
         try:
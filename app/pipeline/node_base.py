@@ -9,7 +9,13 @@ from app.pipeline.context import PipelineContext
 
 
 class PipelineNode(ABC):
-    """管线节点抽象基类，所有节点必须继承此类"""
+    """管线节点抽象基类，所有节点必须继承此类
+
+    节点状态只有 node_id 与 params，运行数据一律写入 ctx；
+    子类应声明 ``__slots__ = ()`` 以保持无 __dict__ 的实例布局。
+    """
+
+    __slots__ = ("node_id", "params")
 
     def __init__(self, node_id: str, params: Dict[str, Any] | None = None):
         """
@@ -4,16 +4,20 @@ from __future__ import annotations
 
 import os
 import re
+import shutil
 import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Mapping, Optional
 
 import requests
 import yt_dlp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.config import APPDATA_PATH, PROFILE_VERSION, TMP_PATH
-from app.core.asr.asr_data import ASRData
+from app.core.asr.asr_data import ASRData, ASRDataSeg
 from app.core.utils.logger import setup_logger
 from app.core.utils.video_utils import get_video_info, video2audio
 from app.pipeline.context import PipelineContext
@@ -28,12 +32,82 @@ DEFAULT_SUBTITLE_TIMEOUT = float(os.getenv("SUBTITLE_DOWNLOAD_TIMEOUT", "30"))
 DEFAULT_VIDEO_MAX_SIZE_MB = int(os.getenv("VIDEO_MAX_SIZE_MB", "4096"))
 DEFAULT_VIDEO_RATE_LIMIT = int(os.getenv("VIDEO_DOWNLOAD_RATE_LIMIT", "0"))
 
+# 文件名清理：Windows 保留字符与 ASCII 控制字符（0x00-0x1F）
+_FORBIDDEN_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f]")
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session() -> requests.Session:
+    """获取进程内共享的 HTTP 会话（线程安全单例），跨任务复用 keep-alive 连接"""
+    global _http_session
+
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=8,
+                    pool_maxsize=16,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=(502, 503, 504),
+                    ),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+
+    return _http_session
+
+
+def _remember_url_info(
+    ctx: PipelineContext, url: str, info: Mapping[str, Any]
+) -> None:
+    """记录下载节点已提取的单视频元信息，供 FetchMetadataNode 读取标题和时长
+
+    只保存 _type 为 video 的结果，播放列表等其他类型不复用。
+    这些信息仅用于读取元数据，不会交给其他 YoutubeDL 实例处理或下载：
+    提取器设置的 cookies 只存在于提取时的实例中，跨实例下载可能被拒绝。
+    """
+    if info.get("_type", "video") == "video":
+        ctx.ydl_info[url] = info
+
+
+def _find_file_by_suffix(
+    directory: str | Path, suffixes: tuple[str, ...]
+) -> Optional[str]:
+    """单次扫描目录，按 suffixes 的先后优先级返回匹配的文件路径
+
+    后缀比较不区分大小写；隐藏文件（如下载中的临时文件）不参与匹配。
+    """
+    best_path: Optional[str] = None
+    best_rank = len(suffixes)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            suffix = os.path.splitext(entry.name)[1].lower()
+            if suffix not in suffixes:
+                continue
+            rank = suffixes.index(suffix)
+            if rank < best_rank and entry.is_file():
+                best_path, best_rank = entry.path, rank
+                if rank == 0:
+                    break
+    return best_path
+
 
 # ============ 输入验证节点 ============
 
 class InputNode(PipelineNode):
     """输入验证节点 - 验证输入参数并设置 source_type"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 验证 source_type
         if ctx.source_type not in ("url", "local"):
@@ -67,13 +141,15 @@ class InputNode(PipelineNode):
 class FetchMetadataNode(PipelineNode):
     """获取视频元数据节点 - 获取视频时长等信息"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 确定视频路径
         video_path = ctx.video_path or ctx.audio_path
 
         if ctx.source_type == "url" and not video_path:
             # URL 模式下，使用 yt-dlp 获取元数据（不下载）
-            duration, title = self._get_url_info(ctx.source_url)
+            duration, title = self._get_url_info(ctx, ctx.source_url)
             ctx.set("video_duration", duration)
             if title and not ctx.get("source_name"):
                 ctx.set("source_name", title)
@@ -98,8 +174,14 @@ class FetchMetadataNode(PipelineNode):
         logger.info(f"视频元数据: 时长={video_info.duration_seconds}s, "
                    f"分辨率={video_info.width}x{video_info.height}")
 
-    def _get_url_info(self, url: str) -> tuple[float, Optional[str]]:
-        """使用 yt-dlp 获取 URL 元信息"""
+    def _get_url_info(
+        self, ctx: PipelineContext, url: str
+    ) -> tuple[float, Optional[str]]:
+        """使用 yt-dlp 获取 URL 元信息，优先复用本次运行中下载节点已提取的结果"""
+        cached = ctx.ydl_info.get(url)
+        if cached is not None:
+            return self._parse_url_info(cached)
+
         ydl_opts = {
             "quiet": True,
             "no_warnings": True,
@@ -111,9 +193,14 @@ class FetchMetadataNode(PipelineNode):
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
-            duration = float(info.get("duration", 0))
-            title = info.get("title")
-            return duration, title if isinstance(title, str) else None
+            return self._parse_url_info(info)
+
+    @staticmethod
+    def _parse_url_info(info: Mapping[str, Any]) -> tuple[float, Optional[str]]:
+        """从 yt-dlp 元信息中读取时长和标题"""
+        duration = float(info.get("duration", 0))
+        title = info.get("title")
+        return duration, title if isinstance(title, str) else None
 
     def get_output_keys(self) -> List[str]:
         return ["video_duration"]
@@ -124,6 +211,8 @@ class FetchMetadataNode(PipelineNode):
 class DownloadSubtitleNode(PipelineNode):
     """下载字幕节点 - 从 URL 下载字幕"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         url = ctx.source_url
         if not url:
@@ -133,7 +222,7 @@ class DownloadSubtitleNode(PipelineNode):
         work_dir = self.params.get("work_dir") or ctx.bundle_dir or str(
             TMP_PATH / ctx.run_id
         )
-        subtitle_path = self._download_subtitle(url, work_dir)
+        subtitle_path = self._download_subtitle(ctx, url, work_dir)
 
         if subtitle_path:
             # 如果有 bundle_dir，将字幕移动到标准位置
@@ -141,9 +230,8 @@ class DownloadSubtitleNode(PipelineNode):
                 ext = Path(subtitle_path).suffix or ".vtt"
                 target_path = Path(ctx.bundle_dir) / f"subtitle{ext.lower()}"
                 if Path(subtitle_path) != target_path:
-                    import shutil
                     target_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(subtitle_path, target_path)
+                    shutil.move(subtitle_path, target_path)
                     subtitle_path = str(target_path)
             ctx.set("subtitle_path", subtitle_path)
             logger.info(f"字幕下载成功: {subtitle_path}")
@@ -151,7 +239,9 @@ class DownloadSubtitleNode(PipelineNode):
             logger.info("未找到可用字幕")
             ctx.set("subtitle_path", None)
 
-    def _download_subtitle(self, url: str, work_dir: str) -> Optional[str]:
+    def _download_subtitle(
+        self, ctx: PipelineContext, url: str, work_dir: str
+    ) -> Optional[str]:
         """下载字幕文件"""
         # 创建临时目录存放字幕
         subtitle_dir = Path(work_dir)
@@ -175,6 +265,7 @@ class DownloadSubtitleNode(PipelineNode):
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
+                _remember_url_info(ctx, url, info)
                 subtitle_language = info.get("language", "")
                 if subtitle_language:
                     subtitle_language = subtitle_language.lower().split("-")[0]
@@ -207,14 +298,16 @@ class DownloadSubtitleNode(PipelineNode):
                     if downloaded:
                         return str(subtitle_path)
 
-                # 尝试使用 yt-dlp 下载
-                ydl.download([url])
+                # 尝试使用 yt-dlp 下载；单个视频直接复用本实例已解析的信息
+                if info.get("_type", "video") == "video":
+                    ydl.process_info(info)
+                else:
+                    ydl.download([url])
 
                 # 查找下载的字幕文件
-                for ext in ("*.vtt", "*.srt", "*.ass"):
-                    files = list(subtitle_dir.glob(ext))
-                    if files:
-                        return str(files[0])
+                found = _find_file_by_suffix(subtitle_dir, (".vtt", ".srt", ".ass"))
+                if found:
+                    return found
 
         except Exception as e:
             logger.warning(f"字幕下载失败: {e}")
@@ -231,7 +324,7 @@ class DownloadSubtitleNode(PipelineNode):
         max_bytes = max_size_mb * 1024 * 1024
         success = False
         try:
-            with requests.get(
+            with _get_http_session().get(
                 url, stream=True, timeout=(10, DEFAULT_SUBTITLE_TIMEOUT)
             ) as response:
                 if not response.ok:
@@ -271,6 +364,8 @@ class DownloadSubtitleNode(PipelineNode):
 class DownloadVideoNode(PipelineNode):
     """下载视频节点 - 按需下载视频（仅在字幕无效时触发）"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         url = ctx.source_url
         if not url:
@@ -280,7 +375,7 @@ class DownloadVideoNode(PipelineNode):
         work_dir = self.params.get("work_dir") or ctx.bundle_dir or str(
             TMP_PATH / ctx.run_id
         )
-        video_path = self._download_video(url, work_dir)
+        video_path = self._download_video(ctx, url, work_dir)
 
         if not video_path:
             raise RuntimeError("视频下载失败")
@@ -289,9 +384,16 @@ class DownloadVideoNode(PipelineNode):
         if ctx.bundle_dir:
             target_path = Path(ctx.bundle_dir) / "video.mp4"
             if Path(video_path) != target_path:
-                import shutil
                 target_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(video_path, target_path)
+                # 同一文件系统内为 rename；跨文件系统时复制后删除源文件
+                shutil.move(video_path, target_path)
+                # 移除 yt-dlp 按标题创建的下载子目录（已为空时）
+                download_dir = Path(video_path).parent
+                if download_dir != target_path.parent:
+                    try:
+                        download_dir.rmdir()
+                    except OSError:
+                        pass
                 video_path = str(target_path)
 
         ctx.set("video_path", video_path)
@@ -299,9 +401,8 @@ class DownloadVideoNode(PipelineNode):
 
     def _sanitize_filename(self, name: str, replacement: str = "_") -> str:
         """清理文件名中不允许的字符"""
-        forbidden_chars = r'<>:"/\\|?*'
-        sanitized = re.sub(f"[{re.escape(forbidden_chars)}]", replacement, name)
-        sanitized = re.sub(r"[\0-\31]", "", sanitized)
+        sanitized = _FORBIDDEN_FILENAME_CHARS_RE.sub(replacement, name)
+        sanitized = _CONTROL_CHARS_RE.sub("", sanitized)
         sanitized = sanitized.rstrip(" .")
 
         max_length = 255
@@ -311,7 +412,9 @@ class DownloadVideoNode(PipelineNode):
 
         return sanitized if sanitized else "default_video"
 
-    def _download_video(self, url: str, work_dir: str) -> Optional[str]:
+    def _download_video(
+        self, ctx: PipelineContext, url: str, work_dir: str
+    ) -> Optional[str]:
         """下载视频文件"""
         max_filesize = self.params.get("max_filesize_mb", DEFAULT_VIDEO_MAX_SIZE_MB)
         rate_limit = self.params.get("rate_limit", DEFAULT_VIDEO_RATE_LIMIT)
@@ -342,26 +445,23 @@ class DownloadVideoNode(PipelineNode):
                 ydl.params["paths"] = {"home": str(video_work_dir)}
                 ydl.process_info(info)
 
-                # 尝试从 yt-dlp 的返回信息中解析最终文件路径
-                candidate_paths: list[str] = []
-                prepared = ydl.prepare_filename(info)
-                if prepared:
-                    candidate_paths.append(prepared)
-
-                requested = info.get("requested_downloads") or []
-                for item in requested:
+                # 优先使用 yt-dlp 记录的实际下载路径（合并格式后扩展名可能变化）
+                for item in info.get("requested_downloads") or []:
                     filepath = item.get("filepath")
-                    if filepath:
-                        candidate_paths.append(filepath)
+                    if filepath and os.path.isfile(filepath):
+                        return str(Path(filepath))
 
-                # 回退：在工作目录中查找常见视频格式
-                for ext in ("*.mp4", "*.mkv", "*.webm", "*.mov"):
-                    for p in video_work_dir.glob(ext):
-                        candidate_paths.append(str(p))
+                # 其次使用输出模板推导的文件名
+                prepared = ydl.prepare_filename(info)
+                if prepared and os.path.isfile(prepared):
+                    return str(Path(prepared))
 
-                for path in candidate_paths:
-                    if path and Path(path).exists():
-                        return str(Path(path))
+                # 回退：在工作目录中查找常见视频格式
+                found = _find_file_by_suffix(
+                    video_work_dir, (".mp4", ".mkv", ".webm", ".mov")
+                )
+                if found:
+                    return found
 
         except Exception as e:
             logger.exception(f"视频下载失败: {e}")
@@ -377,6 +477,8 @@ class DownloadVideoNode(PipelineNode):
 class ParseSubtitleNode(PipelineNode):
     """解析字幕节点 - 将字幕文件解析为结构化数据"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         subtitle_path = ctx.subtitle_path
 
@@ -401,6 +503,8 @@ class ParseSubtitleNode(PipelineNode):
 class ValidateSubtitleNode(PipelineNode):
     """校验字幕节点 - 检查字幕有效性和覆盖率"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         asr_data: Optional[ASRData] = ctx.get("asr_data")
         video_duration = ctx.video_duration
@@ -423,10 +527,9 @@ class ValidateSubtitleNode(PipelineNode):
 
         # 计算字幕覆盖时长（避免用跨度高估）
         segments = asr_data.segments
-        covered_ms = 0.0
-        for seg in segments:
-            seg_duration = max(0.0, seg.end_time - seg.start_time)
-            covered_ms += seg_duration
+        covered_ms = sum(
+            max(0.0, seg.end_time - seg.start_time) for seg in segments
+        )
 
         # 计算覆盖率（以总覆盖时长为准）
         video_duration_ms = video_duration * 1000
@@ -455,6 +558,8 @@ class ValidateSubtitleNode(PipelineNode):
 class ExtractAudioNode(PipelineNode):
     """抽取音频节点 - 从视频提取音频"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         video_path = ctx.video_path
 
@@ -491,6 +596,8 @@ class ExtractAudioNode(PipelineNode):
 class DetectSilenceNode(PipelineNode):
     """静音检测节点 - 判断视频是否为无声视频"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 获取阈值配置
         token_per_min_min = ctx.thresholds.transcript_token_per_min_min
@@ -531,6 +638,8 @@ class DetectSilenceNode(PipelineNode):
 class TranscribeNode(PipelineNode):
     """转录节点 - 音频转文字"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         audio_path = ctx.audio_path
         transcribe_config = None
@@ -557,8 +666,7 @@ class TranscribeNode(PipelineNode):
                 asr_data = transcribe(audio_path, transcribe_config, callback=None)
 
             # 计算 token 数（使用片段文本总字符数估算）
-            total_text = "".join(seg.text for seg in asr_data.segments)
-            token_count = len(total_text)
+            token_count = sum(len(seg.text) for seg in asr_data.segments)
 
             ctx.set("asr_data", asr_data)
             ctx.set("transcript_token_count", token_count)
@@ -593,6 +701,8 @@ class TranscribeNode(PipelineNode):
 class WarningNode(PipelineNode):
     """警告节点 - 输出固定提示信息"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         message = self.params.get("message", "无有效信息")
         ctx.set("summary_text", message)
@@ -602,9 +712,28 @@ class WarningNode(PipelineNode):
         return ["summary_text"]
 
 
+def _join_segment_texts(
+    segments: List[ASRDataSeg], limit: int
+) -> tuple[str, int]:
+    """按换行拼接片段文本并截断到 limit 个字符
+
+    Returns:
+        (截断后的文本, 完整拼接文本的长度)；结果等价于 "\n".join(...)[:limit]
+    """
+    parts: List[str] = []
+    joined_length = -1  # 首个片段前没有换行符
+    for seg in segments:
+        if joined_length < limit:
+            parts.append(seg.text)
+        joined_length += len(seg.text) + 1
+    return "\n".join(parts)[:limit], max(joined_length, 0)
+
+
 class TextSummarizeNode(PipelineNode):
     """文本总结节点 - 使用 LLM 生成摘要"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         try:
             # 获取文本内容
@@ -615,9 +744,6 @@ class TextSummarizeNode(PipelineNode):
                 logger.warning("无有效文本内容用于总结")
                 return
 
-            # 拼接文本
-            full_text = "\n".join(seg.text for seg in asr_data.segments)
-
             # 获取 LLM 配置
             model = self.params.get("model", os.getenv("LLM_MODEL", "gpt-3.5-turbo"))
             max_tokens = self.params.get("max_tokens", 1000)
@@ -637,15 +763,18 @@ class TextSummarizeNode(PipelineNode):
             if max_input_chars <= 0:
                 max_input_chars = 8000
 
-            input_text = full_text[:max_input_chars]
-            if len(full_text) > max_input_chars:
+            # 拼接文本（只拼接截断范围内的片段，不构造完整文本）
+            input_text, full_length = _join_segment_texts(
+                asr_data.segments, max_input_chars
+            )
+            if full_length > max_input_chars:
                 logger.info(
                     "总结输入过长，截断: %d -> %d 字符",
-                    len(full_text),
+                    full_length,
                     max_input_chars,
                 )
             else:
-                logger.info("总结输入长度: %d 字符", len(full_text))
+                logger.info("总结输入长度: %d 字符", full_length)
 
             messages = [
                 {"role": "system", "content": "你是一个专业的视频内容总结助手。"},
@@ -696,6 +825,8 @@ class TextSummarizeNode(PipelineNode):
 class SampleFramesNode(PipelineNode):
     """抽帧节点 - 从视频中采样关键帧（阶段4实现）"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 阶段4实现
         ctx.set("frames_paths", [])
@@ -708,6 +839,8 @@ class SampleFramesNode(PipelineNode):
 class VlmSummarizeNode(PipelineNode):
     """VLM 视觉总结节点（阶段4实现）"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 阶段4实现
         ctx.set("vlm_summary", "")
@@ -720,6 +853,8 @@ class VlmSummarizeNode(PipelineNode):
 class MergeSummaryNode(PipelineNode):
     """合并总结节点 - 合并文本和视觉总结（阶段4实现）"""
 
+    __slots__ = ()
+
     def run(self, ctx: PipelineContext) -> None:
         # 合并已有的总结
         text_summary = ctx.summary_text or ""
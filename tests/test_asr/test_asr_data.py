@@ -49,6 +49,13 @@ class TestASRDataSegEdgeCases:
         assert "\n" in seg.text
         assert seg.text.count("\n") == 2
 
+    def test_slots_reject_unknown_attribute(self):
+        """测试 __slots__ 限制：不允许挂载未声明的属性"""
+        seg = ASRDataSeg("Test", 0, 1000)
+        assert not hasattr(seg, "__dict__")
+        with pytest.raises(AttributeError):
+            seg.speaker = "A"  # type: ignore[attr-defined]
+
 
 class TestASRDataEdgeCases:
     """测试 ASRData 边缘情况"""
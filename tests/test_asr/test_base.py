@@ -0,0 +1,34 @@
+"""BaseASR 基类测试"""
+
+from app.core.asr.asr_data import ASRDataSeg
+from app.core.asr.base import BaseASR
+
+
+class TestBaseASRCache:
+    """BaseASR 缓存行为测试"""
+
+    def test_no_cache_skips_key_and_write(self):
+        """未启用缓存时不计算 key，也不写入缓存"""
+
+        class KeyCountingASR(BaseASR):
+            key_calls = 0
+
+            def _run(self, callback=None, **kwargs):
+                return {"segments": [{"text": "Hi", "start": 0, "end": 1}]}
+
+            def _make_segments(self, resp_data):
+                return [ASRDataSeg(s["text"], s["start"], s["end"]) for s in resp_data["segments"]]
+
+            def _get_key(self):
+                KeyCountingASR.key_calls += 1
+                return super()._get_key()
+
+        asr = KeyCountingASR(b"not-really-audio", use_cache=False)
+        writes = []
+        asr._cache = type("FakeCache", (), {"set": lambda self, *a, **kw: writes.append(a)})()
+
+        result = asr.run()
+
+        assert len(result.segments) == 1
+        assert KeyCountingASR.key_calls == 0
+        assert writes == []
@@ -0,0 +1,66 @@
+"""PipelineContext 单元测试"""
+
+import pytest
+
+from app.pipeline.context import PipelineContext
+
+
+class TestGetSet:
+    """get/set 字段路由测试"""
+
+    def test_standard_field_and_extra(self):
+        ctx = PipelineContext()
+        ctx.set("video_duration", 12.5)
+        ctx.set("custom_key", "v")
+        assert ctx.video_duration == 12.5
+        assert ctx.get("video_duration") == 12.5
+        assert ctx.get("custom_key") == "v"
+        assert ctx.get("missing", "d") == "d"
+
+    def test_protected_fields_go_to_extra(self):
+        ctx = PipelineContext()
+        run_id = ctx.run_id
+        ctx.set("run_id", "other")
+        assert ctx.run_id == run_id
+        assert ctx.extra["run_id"] == "other"
+
+    def test_slots_reject_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            PipelineContext().unknown = 1  # type: ignore[attr-defined]
+
+
+class TestSerialize:
+    """to_dict 序列化测试"""
+
+    def test_extra_values_serialized(self):
+        from enum import Enum
+
+        class Color(Enum):
+            RED = "red"
+
+        class Name(str):
+            pass
+
+        ctx = PipelineContext()
+        ctx.set("nested", {"a": [1, (2, 3)], "b": None})
+        ctx.set("color", Color.RED)
+        ctx.set("name", Name("x"))
+        ctx.set("tags", {"only"})
+
+        result = ctx.to_dict()
+        assert result["nested"] == {"a": [1, [2, 3]], "b": None}
+        assert result["color"] == "red"
+        assert result["name"] == "x"
+        assert result["tags"] == ["only"]
+
+    def test_dataclass_values_serialized(self):
+        from app.pipeline.context import PipelineThresholds, TraceEvent
+
+        ctx = PipelineContext()
+        ctx.set("event", TraceEvent(node_id="n", status="ok", output_keys=["a"]))
+        ctx.set("limits", [PipelineThresholds()])
+
+        result = ctx.to_dict()
+        assert result["event"]["node_id"] == "n"
+        assert result["event"]["output_keys"] == ["a"]
+        assert result["limits"][0]["subtitle_coverage_min"] == 0.8
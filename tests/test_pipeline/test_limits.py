@@ -0,0 +1,37 @@
+"""并发限制器测试"""
+
+import pytest
+
+from app.pipeline.limits import ConcurrencyLimiter
+
+
+class TestConcurrencyLimiter:
+    """ConcurrencyLimiter 测试"""
+
+    def test_acquire_and_release(self):
+        limiter = ConcurrencyLimiter(1, "test")
+        with limiter.acquire():
+            pass
+        # 释放后可再次获取
+        with limiter.acquire(timeout=0):
+            pass
+
+    def test_raises_when_saturated(self):
+        limiter = ConcurrencyLimiter(1, "test")
+        with limiter.acquire():
+            with pytest.raises(RuntimeError, match="test 并发已达上限"):
+                with limiter.acquire(timeout=0.01):
+                    pass
+
+
+class TestEnvParsing:
+    """环境变量解析测试"""
+
+    def test_invalid_value_falls_back_to_default(self, monkeypatch):
+        from app.pipeline.limits import _env_float, _env_int
+
+        monkeypatch.setenv("VS_TEST_LIMIT_INT", "abc")
+        monkeypatch.setenv("VS_TEST_LIMIT_FLOAT", "1.5")
+        assert _env_int("VS_TEST_LIMIT_INT", 3) == 3
+        assert _env_float("VS_TEST_LIMIT_FLOAT", 2.0) == 1.5
+        assert _env_int("VS_TEST_LIMIT_UNSET", 7) == 7
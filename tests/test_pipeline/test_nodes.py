@@ -7,12 +7,16 @@ from app.core.asr.asr_data import ASRData, ASRDataSeg
 from app.pipeline.context import PipelineContext
 from app.pipeline.nodes.core import (
     DetectSilenceNode,
+    DownloadVideoNode,
     ExtractAudioNode,
     FetchMetadataNode,
     InputNode,
     ParseSubtitleNode,
     TextSummarizeNode,
     ValidateSubtitleNode,
+    _find_file_by_suffix,
+    _join_segment_texts,
+    _remember_url_info,
 )
 
 
@@ -258,3 +262,110 @@ class TestNodeOutputKeys:
     def test_text_summarize_output_keys(self):
         node = TextSummarizeNode(node_id="test", params={})
         assert "summary_text" in node.get_output_keys()
+
+
+class TestDownloadVideoNode:
+    """DownloadVideoNode 辅助方法测试"""
+
+    def test_sanitize_filename(self):
+        node = DownloadVideoNode(node_id="dl", params={})
+        assert node._sanitize_filename('a<b>:c"d/e\\f|g?h*i') == "a_b__c_d_e_f_g_h_i"
+        # 0x1A-0x1F 同样属于控制字符
+        assert node._sanitize_filename("t\x00i\x19t\x1al\x1fe") == "title"
+        assert node._sanitize_filename("name. ") == "name"
+        assert node._sanitize_filename("...") == "default_video"
+
+
+class TestUrlInfoReuse:
+    """下载节点提取的元信息在运行内复用测试"""
+
+    def test_remember_single_video_only(self):
+        ctx = PipelineContext(source_type="url", source_url="https://example.com/v")
+        _remember_url_info(ctx, "https://example.com/v", {"id": "v1", "title": "t"})
+        _remember_url_info(
+            ctx, "https://example.com/p", {"_type": "playlist", "entries": []}
+        )
+
+        assert list(ctx.ydl_info) == ["https://example.com/v"]
+
+    def test_fetch_metadata_uses_remembered_info(self, monkeypatch):
+        def no_ydl(*args, **kwargs):
+            raise AssertionError("不应再次创建 YoutubeDL")
+
+        monkeypatch.setattr("app.pipeline.nodes.core.yt_dlp.YoutubeDL", no_ydl)
+        ctx = PipelineContext(source_type="url", source_url="https://example.com/v")
+        _remember_url_info(
+            ctx, ctx.source_url, {"_type": "video", "duration": 12.5, "title": "t"}
+        )
+
+        FetchMetadataNode("meta").run(ctx)
+
+        assert ctx.video_duration == 12.5
+        assert ctx.get("source_name") == "t"
+
+    def test_info_not_exported(self):
+        ctx = PipelineContext(source_type="url", source_url="https://example.com/v")
+        _remember_url_info(ctx, ctx.source_url, {"title": "t"})
+        assert "ydl_info" not in ctx.to_dict()
+        assert ctx.get("ydl_info") is None
+
+
+class TestDownloadVideoRelocation:
+    """下载视频搬移到 bundle 目录测试"""
+
+    def test_moves_video_and_removes_download_dir(self, tmp_path, monkeypatch):
+        download_dir = tmp_path / "Some Title"
+        download_dir.mkdir()
+        downloaded = download_dir / "Some Title.webm"
+        downloaded.write_bytes(b"data")
+
+        monkeypatch.setattr(
+            DownloadVideoNode, "_download_video", lambda self, ctx, url, work_dir: str(downloaded)
+        )
+        ctx = PipelineContext(
+            source_type="url", source_url="https://example.com/v", bundle_dir=str(tmp_path)
+        )
+        DownloadVideoNode("download_video").run(ctx)
+
+        assert ctx.video_path == str(tmp_path / "video.mp4")
+        assert (tmp_path / "video.mp4").read_bytes() == b"data"
+        assert not download_dir.exists()
+
+
+class TestFindFileBySuffix:
+    """下载目录回退查找测试"""
+
+    def test_prefers_earlier_suffix(self, tmp_path):
+        (tmp_path / "a.srt").write_text("")
+        (tmp_path / "b.ASS").write_text("")
+        (tmp_path / "c.VTT").write_text("")
+
+        found = _find_file_by_suffix(tmp_path, (".vtt", ".srt", ".ass"))
+        assert found == str(tmp_path / "c.VTT")
+
+    def test_skips_directories_and_hidden_files(self, tmp_path):
+        (tmp_path / "folder.mp4").mkdir()
+        (tmp_path / ".partial.mp4").write_text("")
+        (tmp_path / "video.mp4.part").write_text("")
+        (tmp_path / "video.webm").write_text("")
+
+        found = _find_file_by_suffix(tmp_path, (".mp4", ".mkv", ".webm", ".mov"))
+        assert found == str(tmp_path / "video.webm")
+
+    def test_no_match(self, tmp_path):
+        (tmp_path / "notes.txt").write_text("")
+        assert _find_file_by_suffix(tmp_path, (".vtt",)) is None
+
+
+class TestJoinSegmentTexts:
+    """总结输入拼接截断测试"""
+
+    @pytest.mark.parametrize("limit", [1, 3, 5, 8, 100])
+    def test_matches_full_join_slice(self, limit):
+        segments = [ASRDataSeg(t, 0, 1) for t in ("ab", "cde", "", "f")]
+        full_text = "\n".join(seg.text for seg in segments)
+
+        assert _join_segment_texts(segments, limit) == (full_text[:limit], len(full_text))
+
+    def test_empty_segments(self):
+        assert _join_segment_texts([], 10) == ("", 0)
@@ -0,0 +1,18 @@
+"""cache 工具函数测试"""
+
+from app.core.utils import cache
+
+
+class TestCacheGetters:
+    """缓存实例获取函数测试"""
+
+    def test_return_singletons(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_PATH", tmp_path)
+        cache.get_asr_cache.cache_clear()
+        try:
+            asr_cache = cache.get_asr_cache()
+            assert cache.get_asr_cache() is asr_cache
+            assert asr_cache.directory == str(tmp_path / "asr_results")
+            asr_cache.close()
+        finally:
+            cache.get_asr_cache.cache_clear()
@@ -0,0 +1,39 @@
+"""subprocess_helper 子进程输出读取测试"""
+
+import sys
+import time
+
+from app.core.utils.subprocess_helper import run_process_with_stream_reader
+
+SCRIPT = (
+    "import sys\n"
+    "sys.stdout.write('one\\ntwo\\r\\nthree\\rtail')\n"
+    "sys.stdout.flush()\n"
+    "sys.stderr.write('err 中文\\n')\n"
+)
+
+
+def _run_and_collect(timeout: float = 5.0):
+    stdout_lines, stderr_lines = [], []
+    process = run_process_with_stream_reader(
+        [sys.executable, "-c", SCRIPT],
+        stdout_handler=stdout_lines.append,
+        stderr_handler=stderr_lines.append,
+    )
+    process.wait(timeout=timeout)
+
+    # 处理线程在进程退出后才读到 EOF，稍等其分发完剩余输出
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and (
+        len(stdout_lines) < 4 or len(stderr_lines) < 1
+    ):
+        time.sleep(0.01)
+    return stdout_lines, stderr_lines
+
+
+def test_delivers_all_lines():
+    """进程退出后不丢失尚未入队的输出，分行与文本模式 readline 一致"""
+    stdout_lines, stderr_lines = _run_and_collect()
+
+    assert stdout_lines == ["one\n", "two\n", "three\n", "tail"]
+    assert stderr_lines == ["err 中文\n"]
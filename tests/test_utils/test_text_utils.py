@@ -0,0 +1,56 @@
+"""text_utils 多语言文本统计测试"""
+
+import pytest
+
+from app.core.utils.text_utils import (
+    count_words,
+    is_mainly_cjk,
+    is_pure_punctuation,
+    is_space_separated_language,
+)
+
+
+class TestCountWords:
+    """count_words 测试"""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("", 0),
+            ("   ", 0),
+            ("Hello world", 2),
+            ("你好世界", 4),
+            ("Hello 世界", 3),
+            ("我爱Python编程", 5),
+            ("这是test测试", 5),
+            ("Привет мир", 2),
+            ("こんにちは world", 6),
+            ("don't stop", 2),
+            ("Hello,\tworld!\n", 2),
+            ("a\u00a0b", 2),  # 不换行空格同样视为分隔符
+        ],
+    )
+    def test_count_words(self, text, expected):
+        assert count_words(text) == expected
+
+
+class TestLanguageDetection:
+    """语言判断函数测试"""
+
+    def test_is_mainly_cjk(self):
+        assert is_mainly_cjk("这是中文句子") is True
+        assert is_mainly_cjk("This is English") is False
+        assert is_mainly_cjk("中文 and English words here") is False
+        assert is_mainly_cjk("") is False
+        assert is_mainly_cjk("   ") is False
+
+    def test_is_space_separated_language(self):
+        assert is_space_separated_language("Hello") is True
+        assert is_space_separated_language(" Привет ") is True
+        assert is_space_separated_language("你好") is False
+        assert is_space_separated_language("") is False
+
+    def test_is_pure_punctuation(self):
+        assert is_pure_punctuation("...!?") is True
+        assert is_pure_punctuation("，。！") is True
+        assert is_pure_punctuation("ok.") is False
@@ -0,0 +1,112 @@
+"""video_utils 媒体信息解析测试"""
+
+from app.core.utils.video_utils import (
+    _parse_ffmpeg_info,
+    _parse_ffprobe_output,
+    _parse_frame_rate,
+)
+
+FFMPEG_INFO = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'a.mp4':
+  Duration: 00:10:05.23, start: 0.000000, bitrate: 2630 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, 1920x1080 [SAR 1:1 DAR 16:9], 2499 kb/s, 29.97 fps, 29.97 tbr, 30k tbn (default)
+  Stream #0:1[0x2](eng): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 128 kb/s (default)
+  Stream #0:2[0x3](chi): Audio: ac3 (ac-3 / 0x332D6361), 44100 Hz, 5.1(side), fltp, 384 kb/s
+At least one output file must be specified
+"""
+
+
+def test_parse_frame_rate():
+    assert _parse_frame_rate("30000/1001") == 30000 / 1001
+    assert _parse_frame_rate("25/1") == 25.0
+    assert _parse_frame_rate("0/0") == 0.0
+    assert _parse_frame_rate("") == 0.0
+
+
+def test_parse_ffprobe_output_video_with_audio_tracks():
+    data = {
+        "format": {"duration": "125.500000", "bit_rate": "1536000"},
+        "streams": [
+            {
+                "index": 0,
+                "codec_type": "video",
+                "codec_name": "h264",
+                "width": 1920,
+                "height": 1080,
+                "avg_frame_rate": "0/0",
+                "r_frame_rate": "24/1",
+            },
+            {
+                "index": 1,
+                "codec_type": "audio",
+                "codec_name": "aac",
+                "sample_rate": "48000",
+                "tags": {"language": "eng"},
+            },
+            {
+                "index": 2,
+                "codec_type": "audio",
+                "codec_name": "ac3",
+                "sample_rate": "44100",
+                "tags": {"language": "chi", "title": "国语"},
+            },
+        ],
+    }
+
+    probe = _parse_ffprobe_output(data)
+
+    assert probe.has_video_stream
+    assert (probe.video_codec, probe.width, probe.height) == ("h264", 1920, 1080)
+    assert probe.fps == 24.0
+    assert probe.duration_seconds == 125.5
+    assert probe.bitrate_kbps == 1536
+    assert (probe.audio_codec, probe.audio_sampling_rate) == ("aac", 48000)
+    assert [(a.index, a.codec, a.language) for a in probe.audio_streams] == [
+        (1, "aac", "eng"),
+        (2, "ac3", "chi"),
+    ]
+    assert probe.audio_streams[1].title == "国语"
+
+
+def test_parse_ffprobe_output_audio_only():
+    probe = _parse_ffprobe_output(
+        {
+            "format": {"duration": "3.2"},
+            "streams": [{"index": 0, "codec_type": "audio", "codec_name": "mp3", "sample_rate": "16000"}],
+        }
+    )
+
+    assert not probe.has_video_stream
+    assert (probe.width, probe.height, probe.fps) == (0, 0, 0.0)
+    assert probe.bitrate_kbps == 0
+    assert len(probe.audio_streams) == 1
+
+
+def test_parse_ffmpeg_info():
+    probe = _parse_ffmpeg_info(FFMPEG_INFO)
+
+    assert probe.duration_seconds == 605.23
+    assert probe.bitrate_kbps == 2630
+    assert (probe.video_codec, probe.width, probe.height, probe.fps) == ("h264", 1920, 1080, 29.97)
+    assert (probe.audio_codec, probe.audio_sampling_rate) == ("aac", 48000)
+    assert [(a.index, a.codec, a.language) for a in probe.audio_streams] == [
+        (1, "aac", "eng"),
+        (2, "ac3", "chi"),
+    ]
+
+
+def test_video2audio_reports_failure_without_raising(tmp_path, monkeypatch):
+    """ffmpeg 返回非零时返回 False，而不是抛出异常"""
+    import sys
+
+    from app.core.utils import video_utils
+
+    real_popen = video_utils.subprocess.Popen
+
+    def fake_popen(cmd, **kwargs):
+        script = "import sys; sys.stderr.write('line\\n' * 1000); sys.exit(1)"
+        return real_popen([sys.executable, "-c", script], **kwargs)
+
+    monkeypatch.setattr(video_utils.subprocess, "Popen", fake_popen)
+
+    assert video_utils.video2audio("in.mp4", str(tmp_path / "out.wav")) is False